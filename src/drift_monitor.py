@@ -0,0 +1,253 @@
+# src/drift_monitor.py
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, Any, List, Deque, Iterator, Optional
+
+EPS = 1e-6
+FLUSH_ROWS = 1000
+TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    p = expected / max(1.0, expected.sum()) + EPS
+    q = actual / max(1.0, actual.sum()) + EPS
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def _ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    # KS on the binned CDFs: a lower bound on the exact two-sample statistic
+    p = np.cumsum(expected) / max(1.0, expected.sum())
+    q = np.cumsum(actual) / max(1.0, actual.sum())
+    return float(np.max(np.abs(p - q)))
+
+
+def _numeric(ser: pd.Series) -> np.ndarray:
+    # bools come through to_numeric unchanged, and inf would poison the quantile edges
+    vals = pd.to_numeric(ser, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return vals[np.isfinite(vals)]
+
+
+class DriftMonitor:
+    """Tracks drift batch by batch against a fixed baseline and a rolling window.
+
+    Each numeric column is reduced to counts over bins fixed from the baseline,
+    so updates cost O(batch) and no past batch is ever re-read. save() appends
+    new timeline rows to a JSONL log and rewrites a small state file recording
+    how much of that log it covers.
+    """
+
+    def __init__(self, baseline: pd.DataFrame = None, cols: List[str] = None,
+                 window: int = 10, n_bins: int = 20, outputs_dir: str = "outputs",
+                 psi_warn: float = 0.1, psi_alert: float = 0.25, ks_alert: float = 0.2,
+                 max_timeline: int = 10000):
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        if n_bins < 2:
+            raise ValueError(f"n_bins must be >= 2, got {n_bins}")
+        self.window = window
+        self.n_bins = n_bins
+        self.psi_warn = psi_warn
+        self.psi_alert = psi_alert
+        self.ks_alert = ks_alert
+        self.state_path = os.path.join(outputs_dir, "drift_monitor_state.json")
+        self.timeline_path = os.path.join(outputs_dir, "drift_monitor_timeline.jsonl")
+        self.edges: Dict[str, np.ndarray] = {}
+        self.baseline_counts: Dict[str, np.ndarray] = {}
+        self.ring: Dict[str, List[np.ndarray]] = {}
+        self.ring_pos = 0
+        self.window_counts: Dict[str, np.ndarray] = {}
+        self.alerts: Dict[str, Dict[str, Any]] = {}
+        # recent rows only; the full history is in timeline_path
+        self.timeline: Deque[Dict[str, Any]] = deque(maxlen=max_timeline)
+        self._unsaved: List[Dict[str, Any]] = []
+        # bytes of timeline_path covered by the last saved state
+        self._timeline_offset = 0
+        self._timeline_end = 0
+        self._timeline_synced = False
+        self.n_batches = 0
+        if baseline is not None:
+            self._fit_baseline(baseline, cols)
+
+    def _fit_baseline(self, baseline: pd.DataFrame, cols: List[str] = None):
+        if cols is None:
+            cols = baseline.columns.tolist()
+        for c in cols:
+            a = _numeric(baseline[c])
+            if len(a) < 5:
+                continue
+            qs = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+            # inner edges only; the outer bins are open-ended so new ranges still land somewhere
+            edges = np.unique(np.quantile(a, qs))
+            self.edges[c] = edges
+            self.baseline_counts[c] = self._bin(c, a)
+            self.ring[c] = [np.zeros(len(edges) + 1) for _ in range(self.window)]
+            self.window_counts[c] = np.zeros(len(edges) + 1)
+            self.alerts[c] = {"level": "ok", "since_batch": None}
+
+    def _bin(self, col: str, values: np.ndarray) -> np.ndarray:
+        edges = self.edges[col]
+        idx = np.searchsorted(edges, values, side="right")
+        return np.bincount(idx, minlength=len(edges) + 1).astype(float)
+
+    def _level(self, psi: float, ks: float) -> str:
+        if psi >= self.psi_alert or ks >= self.ks_alert:
+            return "alert"
+        if psi >= self.psi_warn:
+            return "warn"
+        return "ok"
+
+    def update(self, batch: pd.DataFrame, batch_id: Any = None) -> Dict[str, Any]:
+        if batch_id is None:
+            batch_id = self.n_batches
+        report = {}
+        for c, edges in self.edges.items():
+            if c not in batch.columns:
+                report[c] = {"status": "missing_column"}
+                self._evict_slot(c)
+                continue
+            b = _numeric(batch[c])
+            if len(b) < 5:
+                report[c] = {"status": "insufficient_data"}
+                self._evict_slot(c)
+                continue
+            counts = self._bin(c, b)
+            # rolling reference is the window *before* this batch
+            has_window = self.window_counts[c].sum() > 0
+            stats = {
+                "n": int(len(b)),
+                "mean": float(b.mean()),
+                "psi_baseline": _psi(self.baseline_counts[c], counts),
+                "ks_baseline": _ks(self.baseline_counts[c], counts),
+                "psi_window": _psi(self.window_counts[c], counts) if has_window else None,
+                "ks_window": _ks(self.window_counts[c], counts) if has_window else None
+            }
+            psi = max(stats["psi_baseline"], stats["psi_window"] or 0.0)
+            ks = max(stats["ks_baseline"], stats["ks_window"] or 0.0)
+            level = self._level(psi, ks)
+            if level != self.alerts[c]["level"]:
+                self.alerts[c] = {"level": level, "since_batch": batch_id}
+            stats["level"] = level
+            report[c] = stats
+
+            # ring buffer: drop the oldest batch's counts, add this one's
+            self.window_counts[c] += counts - self.ring[c][self.ring_pos]
+            self.ring[c][self.ring_pos] = counts
+            row = {"batch": batch_id, "ts": time.time(), "col": c, **stats}
+            self.timeline.append(row)
+            self._unsaved.append(row)
+        if len(self._unsaved) >= FLUSH_ROWS:
+            # keep memory bounded between saves; rows only count once save() commits them
+            self._flush_timeline()
+        self.ring_pos = (self.ring_pos + 1) % self.window
+        self.n_batches += 1
+        return report
+
+    def _evict_slot(self, col: str):
+        # a skipped batch still takes its place in the window, so the batch
+        # it pushes out must leave the rolling counts too
+        self.window_counts[col] -= self.ring[col][self.ring_pos]
+        self.ring[col][self.ring_pos] = np.zeros_like(self.window_counts[col])
+
+    def timeline_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(list(self.timeline))
+
+    def _flush_timeline(self):
+        # rows past the committed offset belong to no saved state (a crash
+        # between append and state replace, or a fresh monitor reusing the
+        # dir); drop them once before this process first appends
+        os.makedirs(os.path.dirname(self.timeline_path) or ".", exist_ok=True)
+        with open(self.timeline_path, "a+b") as f:
+            if not self._timeline_synced:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > self._timeline_offset:
+                    f.truncate(self._timeline_offset)
+                self._timeline_synced = True
+            for row in self._unsaved:
+                f.write((json.dumps(row, default=str) + "\n").encode("utf-8"))
+            f.flush()
+            self._timeline_end = f.tell()
+        self._unsaved = []
+
+    @staticmethod
+    def _committed_offset(outputs_dir: str) -> Optional[int]:
+        path = os.path.join(outputs_dir, "drift_monitor_state.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("timeline_offset", 0)
+
+    @classmethod
+    def iter_timeline(cls, outputs_dir: str = "outputs") -> Iterator[Dict[str, Any]]:
+        # full saved history, for plotting; load() only reads the tail
+        path = os.path.join(outputs_dir, "drift_monitor_timeline.jsonl")
+        end = cls._committed_offset(outputs_dir)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            for line in f:
+                if end is not None and f.tell() > end:
+                    break
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def _tail_rows(path: str, end: int, n: int) -> List[Dict[str, Any]]:
+        # read backwards from the committed offset until n rows are found
+        if n <= 0 or end <= 0 or not os.path.exists(path):
+            return []
+        buf = b""
+        pos = end
+        with open(path, "rb") as f:
+            while pos > 0 and buf.count(b"\n") <= n:
+                step = min(TAIL_BLOCK_BYTES, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+        lines = [ln for ln in buf.split(b"\n") if ln.strip()]
+        if pos > 0:
+            lines = lines[1:]  # first line may be partial
+        return [json.loads(ln) for ln in lines[-n:]]
+
+    def save(self):
+        self._flush_timeline()
+        state = {
+            "window": self.window,
+            "n_bins": self.n_bins,
+            "thresholds": {"psi_warn": self.psi_warn, "psi_alert": self.psi_alert, "ks_alert": self.ks_alert},
+            "max_timeline": self.timeline.maxlen,
+            "ring_pos": self.ring_pos,
+            "n_batches": self.n_batches,
+            "timeline_offset": self._timeline_end,
+            "edges": {c: e.tolist() for c, e in self.edges.items()},
+            "baseline_counts": {c: v.tolist() for c, v in self.baseline_counts.items()},
+            "ring": {c: [v.tolist() for v in r] for c, r in self.ring.items()},
+            "alerts": self.alerts
+        }
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, default=str)
+        os.replace(tmp, self.state_path)
+        self._timeline_offset = self._timeline_end
+        return self.state_path
+
+    @classmethod
+    def load(cls, outputs_dir: str = "outputs") -> "DriftMonitor":
+        path = os.path.join(outputs_dir, "drift_monitor_state.json")
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        mon = cls(window=state["window"], n_bins=state["n_bins"], outputs_dir=outputs_dir,
+                  max_timeline=state["max_timeline"], **state["thresholds"])
+        mon.ring_pos = state["ring_pos"]
+        mon.n_batches = state["n_batches"]
+        mon._timeline_offset = mon._timeline_end = state.get("timeline_offset", 0)
+        mon.edges = {c: np.array(e) for c, e in state["edges"].items()}
+        mon.baseline_counts = {c: np.array(v) for c, v in state["baseline_counts"].items()}
+        mon.ring = {c: [np.array(v) for v in r] for c, r in state["ring"].items()}
+        mon.window_counts = {c: np.sum(r, axis=0) for c, r in mon.ring.items()}
+        mon.alerts = state["alerts"]
+        mon.timeline.extend(cls._tail_rows(mon.timeline_path, mon._timeline_offset, mon.timeline.maxlen))
+        return mon
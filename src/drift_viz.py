@@ -58,3 +58,28 @@ def generate_drift_plots(baseline_df: pd.DataFrame, new_df: pd.DataFrame, cols:
         except Exception:
             continue
     return saved
+
+def plot_drift_timeline(timeline: List[dict], outputs_dir: str="outputs", metric: str="psi_baseline"):
+    # timeline is DriftMonitor.timeline: one record per (batch, column)
+    plot_dir = ensure_plot_dir(outputs_dir)
+    df = pd.DataFrame(timeline)
+    saved = []
+    if df.empty or metric not in df.columns:
+        return saved
+    for c, g in df.groupby("col"):
+        try:
+            outpath = os.path.join(plot_dir, f"timeline_{metric}_{c}.png")
+            plt.figure()
+            plt.plot(range(len(g)), pd.to_numeric(g[metric], errors="coerce"), marker="o")
+            plt.xticks(range(len(g)), g["batch"].astype(str), rotation=45)
+            plt.title(f"{metric} over batches: {c}")
+            plt.xlabel("batch")
+            plt.ylabel(metric)
+            plt.tight_layout()
+            plt.savefig(outpath)
+            plt.close()
+            saved.append({"col": c, "timeline": outpath})
+        except Exception:
+            plt.close()
+            continue
+    return saved
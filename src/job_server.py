@@ -0,0 +1,374 @@
+# src/job_server.py
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, Tuple, Callable, Deque
+
+MAX_BODY_BYTES = 64 * 1024
+JOB_FIELDS = ("path", "baseline_path", "evaluate_imputations", "target_column", "problem_type")
+
+
+def _validate_params(params: Dict[str, Any]) -> Optional[str]:
+    # reject bad types here, before a job exists, rather than inside a worker
+    if not isinstance(params.get("path"), str) or not params["path"]:
+        return "'path' must be a non-empty string"
+    for k in ("baseline_path", "target_column", "problem_type"):
+        if params.get(k) is not None and not isinstance(params[k], str):
+            return f"'{k}' must be a string"
+    if params.get("evaluate_imputations") is not None and not isinstance(params["evaluate_imputations"], bool):
+        return "'evaluate_imputations' must be true or false"
+    return None
+
+
+def _warm_worker():
+    # pay the pandas / sklearn / matplotlib import cost once per worker, not per job
+    import matplotlib
+    matplotlib.use("Agg")
+    from . import supervisor  # noqa: F401
+
+
+def _run_job(params: Dict[str, Any], outputs_dir: str) -> Dict[str, Any]:
+    from .supervisor import SupervisorAgent
+    sup = SupervisorAgent(baseline_path=params.get("baseline_path"), outputs_dir=outputs_dir)
+    out = sup.run_full(
+        params["path"],
+        evaluate_imputations=params.get("evaluate_imputations", False),
+        target_column=params.get("target_column"),
+        problem_type=params.get("problem_type") or "classification"
+    )
+    # round-trip through json so the parent only ever holds plain types
+    return json.loads(json.dumps(out, default=str))
+
+
+class JobManager:
+    def __init__(self, workers: int = None, max_pending: int = None, outputs_dir: str = "outputs",
+                 max_finished: int = 1000, runner: Callable = _run_job, initializer: Callable = _warm_worker,
+                 start_timeout: float = 300.0, retry_interval: float = 30.0):
+        self.workers = workers or os.cpu_count() or 1
+        # admission control: queued + running jobs never exceed this
+        self.max_pending = max_pending or self.workers * 4
+        # finished jobs kept in memory; results themselves live in outputs/jobs/<id>/result.json
+        self.max_finished = max_finished
+        self.outputs_dir = outputs_dir
+        self.runner = runner
+        self.initializer = initializer
+        self.start_timeout = start_timeout
+        # after a failed pool start, wait this long before trying again
+        self.retry_interval = retry_interval
+        self._retry_at = 0.0
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.queue: Deque[str] = deque()
+        # job id -> (future, pool it was submitted to)
+        self.running: Dict[str, Tuple[Future, ProcessPoolExecutor]] = {}
+        self.finished: Deque[str] = deque()
+        self.pool_restarts = 0
+        self._stale_pool = None
+        self._stopping = False
+        # re-entrant: a done callback can fire synchronously while the dispatcher holds the lock
+        self.lock = threading.RLock()
+        self.cond = threading.Condition(self.lock)
+        self.pool = self._start_pool()
+        if self.pool is None:
+            self._retry_at = time.time() + self.retry_interval
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+
+    def _start_pool(self) -> Optional[ProcessPoolExecutor]:
+        # block until the workers have run the initializer, so a broken import
+        # shows up here as an unavailable pool rather than as failed jobs
+        pool = None
+        try:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer)
+            warm = [pool.submit(int) for _ in range(self.workers)]
+            for fut in warm:
+                fut.result(timeout=self.start_timeout)
+        except Exception:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            return None
+        return pool
+
+    def _needs_restart(self) -> bool:
+        if self.pool is None:
+            return time.time() >= self._retry_at
+        return self._stale_pool is self.pool
+
+    def _restart_pool(self):
+        # called with the lock held; released while the new workers warm up
+        old = self.pool
+        self.cond.release()
+        try:
+            if old is not None:
+                old.shutdown(wait=False, cancel_futures=True)
+            new = self._start_pool()
+        finally:
+            self.cond.acquire()
+        if self._stopping and new is not None:
+            new.shutdown(wait=False, cancel_futures=True)
+            new = None
+        self.pool = new
+        self._stale_pool = None
+        self.pool_restarts += 1
+        if new is None:
+            self._retry_at = time.time() + self.retry_interval
+            while self.queue:
+                job = self.jobs[self.queue.popleft()]
+                job["status"] = "failed"
+                job["error"] = "worker pool unavailable"
+                self._finish(job)
+
+    def _active(self) -> int:
+        # jobs with a cancel pending still hold a worker, so they stay in self.running
+        return len(self.queue) + len(self.running)
+
+    def submit(self, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        err = _validate_params(params)
+        if err:
+            return None, err
+        params = {k: params[k] for k in JOB_FIELDS if params.get(k) is not None}
+        with self.lock:
+            if self.pool is None:
+                self.cond.notify_all()  # let the dispatcher retry starting the pool
+                return None, "unavailable"
+            if self._active() >= self.max_pending:
+                return None, "queue_full"
+            job_id = uuid.uuid4().hex[:12]
+            # each job writes to its own dir so concurrent runs don't clobber cleaned_output.csv
+            job_dir = os.path.join(self.outputs_dir, "jobs", job_id)
+            self.jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "params": params,
+                "outputs_dir": job_dir,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "result_path": None
+            }
+            self.queue.append(job_id)
+            self.cond.notify_all()
+            return self.status(job_id), None
+
+    def _dispatch_loop(self):
+        # jobs are handed to the pool only when a worker is free, so anything
+        # still in self.queue is guaranteed not to have started
+        with self.cond:
+            while not self._stopping:
+                if self._needs_restart():
+                    self._restart_pool()
+                while self.pool is not None and self.queue and len(self.running) < self.workers:
+                    job_id = self.queue.popleft()
+                    job = self.jobs[job_id]
+                    pool = self.pool
+                    try:
+                        fut = pool.submit(self.runner, job["params"], job["outputs_dir"])
+                    except (BrokenProcessPool, RuntimeError) as e:
+                        job["status"] = "failed"
+                        job["error"] = f"{type(e).__name__}: {e}"
+                        self._finish(job)
+                        self._stale_pool = pool
+                        break
+                    job["status"] = "running"
+                    job["started_at"] = time.time()
+                    self.running[job_id] = (fut, pool)
+                    fut.add_done_callback(lambda f, jid=job_id: self._on_done(jid, f))
+                if not self._needs_restart():
+                    self.cond.wait(timeout=1.0)
+
+    def _on_done(self, job_id: str, fut: Future):
+        result, error = None, None
+        try:
+            result = fut.result()
+        except BaseException as e:
+            error = e
+        with self.lock:
+            _, pool = self.running.pop(job_id)
+            job = self.jobs[job_id]
+            if isinstance(error, BrokenProcessPool):
+                # a worker died (OOM, segfault, failing initializer): rebuild before the next dispatch
+                self._stale_pool = pool
+            if job["status"] == "cancel_requested":
+                job["status"] = "cancelled"
+            elif error is not None:
+                job["status"] = "failed"
+                job["error"] = f"{type(error).__name__}: {error}"
+            else:
+                job["result_path"] = self._spill(job, result)
+                job["status"] = "done" if job["result_path"] else "failed"
+            self._finish(job)
+            self.cond.notify_all()
+
+    def _spill(self, job: Dict[str, Any], result: Dict[str, Any]) -> Optional[str]:
+        path = os.path.join(job["outputs_dir"], "result.json")
+        try:
+            os.makedirs(job["outputs_dir"], exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(result, f, default=str)
+        except OSError as e:
+            job["error"] = f"could not write result: {e}"
+            return None
+        return path
+
+    def _finish(self, job: Dict[str, Any]):
+        job["finished_at"] = time.time()
+        self.finished.append(job["id"])
+        while len(self.finished) > self.max_finished:
+            self.jobs.pop(self.finished.popleft(), None)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+        result = None
+        if job["status"] == "done":
+            try:
+                with open(job["result_path"], "r", encoding="utf-8") as f:
+                    result = json.load(f)
+            except (OSError, ValueError) as e:
+                job["error"] = f"could not read result: {e}"
+        return {"id": job_id, "status": job["status"], "error": job["error"], "result": result}
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] == "queued":
+                self.queue.remove(job_id)
+                job["status"] = "cancelled"
+                self._finish(job)
+            elif job["status"] == "running":
+                # already on a worker: it runs to completion, then the result is dropped
+                job["status"] = "cancel_requested"
+            return dict(job)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            counts: Dict[str, int] = {}
+            for job in self.jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "active": self._active(),
+                "pool_available": self.pool is not None,
+                "pool_restarts": self.pool_restarts,
+                "jobs": counts
+            }
+
+    def shutdown(self):
+        with self.cond:
+            self._stopping = True
+            self.cond.notify_all()
+            pool = self.pool
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    manager: JobManager = None
+
+    def _send(self, code: int, payload: Any):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        return parts
+
+    def do_GET(self):
+        parts = self._route()
+        if parts == ["health"]:
+            return self._send(200, self.manager.stats())
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.manager.status(parts[1])
+            return self._send(200, job) if job else self._send(404, {"error": "unknown job"})
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            res = self.manager.result(parts[1])
+            if res is None:
+                return self._send(404, {"error": "unknown job"})
+            if res["status"] in ("queued", "running", "cancel_requested"):
+                return self._send(202, res)
+            return self._send(200, res)
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self._route() != ["jobs"]:
+            return self._send(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            return self._send(400, {"error": f"Content-Length must be between 0 and {MAX_BODY_BYTES}"})
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send(400, {"error": "invalid json"})
+        if not isinstance(params, dict):
+            return self._send(400, {"error": "expected a json object"})
+        job, err = self.manager.submit(params)
+        if err == "queue_full":
+            return self._send(429, {"error": err, **self.manager.stats()})
+        if err == "unavailable":
+            return self._send(503, {"error": "worker pool unavailable", **self.manager.stats()})
+        if err:
+            return self._send(400, {"error": err})
+        self._send(202, job)
+
+    def do_DELETE(self):
+        parts = self._route()
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.manager.cancel(parts[1])
+            return self._send(200, job) if job else self._send(404, {"error": "unknown job"})
+        self._send(404, {"error": "not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = None,
+          max_pending: int = None, outputs_dir: str = "outputs", max_finished: int = 1000):
+    manager = JobManager(workers=workers, max_pending=max_pending, outputs_dir=outputs_dir,
+                         max_finished=max_finished)
+    handler = type("BoundJobRequestHandler", (JobRequestHandler,), {"manager": manager})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"AdaptiveDataDoctor job server on http://{host}:{port} ({manager.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run SupervisorAgent jobs on a warm worker pool")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--max-pending", type=int, default=None)
+    ap.add_argument("--outputs-dir", default="outputs")
+    ap.add_argument("--max-finished", type=int, default=1000)
+    args = ap.parse_args()
+    serve(args.host, args.port, args.workers, args.max_pending, args.outputs_dir, args.max_finished)
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from src.drift_monitor import DriftMonitor
+
+
+def _batch(rng, shift=0.0, n=500):
+    return pd.DataFrame({"a": rng.normal(shift, 1, n)})
+
+
+def test_shift_raises_alert(tmp_path):
+    rng = np.random.default_rng(0)
+    mon = DriftMonitor(pd.DataFrame({"a": rng.normal(0, 1, 5000)}), window=3, outputs_dir=str(tmp_path))
+    for _ in range(3):
+        assert mon.update(_batch(rng))["a"]["level"] == "ok"
+    assert mon.update(_batch(rng, shift=1.0))["a"]["level"] == "alert"
+    assert mon.alerts["a"] == {"level": "alert", "since_batch": 3}
+
+
+def test_skipped_batches_age_out_of_window(tmp_path):
+    rng = np.random.default_rng(1)
+    mon = DriftMonitor(pd.DataFrame({"a": rng.normal(0, 1, 5000)}), window=2, outputs_dir=str(tmp_path))
+    mon.update(_batch(rng, shift=3.0))
+    assert mon.update(pd.DataFrame({"a": [1.0, 2.0]}))["a"] == {"status": "insufficient_data"}
+    mon.update(pd.DataFrame({"b": [1.0] * 10}))
+    # the shifted batch is now older than the window
+    assert mon.window_counts["a"].sum() == 0
+    assert mon.update(_batch(rng))["a"]["psi_window"] is None
+
+
+def test_save_appends_timeline_and_load_resumes(tmp_path):
+    rng = np.random.default_rng(2)
+    mon = DriftMonitor(pd.DataFrame({"a": rng.normal(0, 1, 5000)}), window=3, outputs_dir=str(tmp_path),
+                       max_timeline=2)
+    for _ in range(2):
+        mon.update(_batch(rng))
+        mon.save()
+    mon.update(_batch(rng))
+    mon.save()
+    assert len(mon.timeline) == 2
+    assert [r["batch"] for r in DriftMonitor.iter_timeline(str(tmp_path))] == [0, 1, 2]
+
+    loaded = DriftMonitor.load(str(tmp_path))
+    assert np.array_equal(loaded.window_counts["a"], mon.window_counts["a"])
+    assert [r["batch"] for r in loaded.timeline] == [1, 2]
+    assert (loaded.ring_pos, loaded.n_batches, loaded.alerts) == (mon.ring_pos, mon.n_batches, mon.alerts)
+    batch = _batch(rng)
+    assert loaded.update(batch, batch_id=3)["a"]["psi_window"] == mon.update(batch, batch_id=3)["a"]["psi_window"]
+
+
+def test_bool_and_inf_columns(tmp_path):
+    rng = np.random.default_rng(4)
+    base = pd.DataFrame({
+        "flag": [True, False] * 50,
+        "x": np.r_[rng.normal(0, 1, 98), np.inf, -np.inf]
+    })
+    mon = DriftMonitor(base, window=2, outputs_dir=str(tmp_path))
+    assert np.isfinite(mon.edges["x"]).all()
+    assert mon.baseline_counts["x"].sum() == 98
+    report = mon.update(pd.DataFrame({"flag": [True] * 20, "x": np.r_[rng.normal(0, 1, 19), np.inf]}))
+    assert report["flag"]["level"] == "alert"
+    assert report["x"]["n"] == 19
+
+
+@pytest.mark.parametrize("kwargs", [{"window": 0}, {"window": -1}, {"n_bins": 1}])
+def test_invalid_window_or_bins(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        DriftMonitor(pd.DataFrame({"a": range(10)}), outputs_dir=str(tmp_path), **kwargs)
+
+
+def test_unsaved_rows_flushed_but_uncommitted_rows_dropped_on_resume(tmp_path, monkeypatch):
+    import src.drift_monitor as dm
+    monkeypatch.setattr(dm, "FLUSH_ROWS", 2)
+    rng = np.random.default_rng(5)
+    mon = DriftMonitor(pd.DataFrame({"a": rng.normal(0, 1, 5000)}), window=3, outputs_dir=str(tmp_path))
+    batches = [_batch(rng) for _ in range(5)]
+    for b in batches[:2]:
+        mon.update(b)
+    mon.save()
+    # simulate a crash: rows 2-4 reach the log (via the periodic flush) but the state is never saved
+    for b in batches[2:]:
+        mon.update(b)
+        assert len(mon._unsaved) < 2
+    assert len(DriftMonitor._tail_rows(mon.timeline_path, os.path.getsize(mon.timeline_path), 10)) == 4
+
+    resumed = DriftMonitor.load(str(tmp_path))
+    assert [r["batch"] for r in resumed.timeline] == [0, 1]
+    assert [r["batch"] for r in DriftMonitor.iter_timeline(str(tmp_path))] == [0, 1]
+    for b in batches[2:]:
+        resumed.update(b)
+    resumed.save()
+    assert [r["batch"] for r in DriftMonitor.iter_timeline(str(tmp_path))] == [0, 1, 2, 3, 4]
+
+
+def test_load_reads_only_the_tail(tmp_path, monkeypatch):
+    import src.drift_monitor as dm
+    monkeypatch.setattr(dm, "TAIL_BLOCK_BYTES", 64)
+    rng = np.random.default_rng(6)
+    mon = DriftMonitor(pd.DataFrame({"a": rng.normal(0, 1, 5000)}), window=3, outputs_dir=str(tmp_path),
+                       max_timeline=3)
+    for _ in range(20):
+        mon.update(_batch(rng))
+    mon.save()
+    resumed = DriftMonitor.load(str(tmp_path))
+    assert [r["batch"] for r in resumed.timeline] == [17, 18, 19]
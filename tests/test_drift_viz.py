@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+from src.drift_monitor import DriftMonitor
+from src.drift_viz import plot_drift_timeline
+
+
+def test_plot_drift_timeline_writes_png_per_column(tmp_path):
+    rng = np.random.default_rng(0)
+    base = pd.DataFrame({"a": rng.normal(0, 1, 1000), "b": rng.normal(5, 2, 1000)})
+    mon = DriftMonitor(base, window=2, outputs_dir=str(tmp_path))
+    for shift in (0.0, 0.0, 1.0):
+        mon.update(pd.DataFrame({"a": rng.normal(shift, 1, 200), "b": rng.normal(5, 2, 200)}))
+
+    saved = plot_drift_timeline(mon.timeline, outputs_dir=str(tmp_path))
+
+    assert sorted(s["col"] for s in saved) == ["a", "b"]
+    for s in saved:
+        assert os.path.getsize(s["timeline"]) > 0
+        with open(s["timeline"], "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_plot_drift_timeline_empty(tmp_path):
+    assert plot_drift_timeline([], outputs_dir=str(tmp_path)) == []
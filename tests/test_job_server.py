@@ -0,0 +1,220 @@
+import http.client
+import json
+import os
+import time
+import threading
+import urllib.request
+import urllib.error
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from src.job_server import JobManager, JobRequestHandler
+
+
+def _noop():
+    pass
+
+
+def _broken_init():
+    raise ImportError("pandas is broken")
+
+
+def _stub_run(params, outputs_dir):
+    # blocks until "<path>.go" exists so tests control exactly when a job finishes
+    path = params["path"]
+    if path.endswith("crash"):
+        os._exit(1)
+    while not os.path.exists(path + ".go"):
+        time.sleep(0.01)
+    if path.endswith("fail"):
+        raise ValueError("boom")
+    return {"path": path, "outputs_dir": outputs_dir}
+
+
+def _wait_for(pred, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if pred():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _release(path):
+    open(path + ".go", "w").close()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    mgr = JobManager(workers=1, max_pending=3, outputs_dir=str(tmp_path / "outputs"),
+                     runner=_stub_run, initializer=_noop)
+    yield mgr
+    # unblock every stub still waiting so worker processes can exit
+    for job in list(mgr.jobs.values()):
+        _release(job["params"]["path"])
+    mgr.shutdown()
+
+
+def _status(mgr, job_id):
+    return mgr.status(job_id)["status"]
+
+
+def test_only_jobs_on_a_worker_are_running(manager, tmp_path):
+    ids = [manager.submit({"path": str(tmp_path / f"j{i}")})[0]["id"] for i in range(3)]
+    assert _wait_for(lambda: _status(manager, ids[0]) == "running")
+    assert [_status(manager, i) for i in ids[1:]] == ["queued", "queued"]
+
+
+def test_queue_full(manager, tmp_path):
+    for i in range(3):
+        job, err = manager.submit({"path": str(tmp_path / f"j{i}")})
+        assert err is None
+    job, err = manager.submit({"path": str(tmp_path / "j3")})
+    assert job is None and err == "queue_full"
+
+
+def test_cancel_queued_job_never_runs(manager, tmp_path):
+    first = manager.submit({"path": str(tmp_path / "a")})[0]["id"]
+    queued = manager.submit({"path": str(tmp_path / "b")})[0]["id"]
+    assert manager.cancel(queued)["status"] == "cancelled"
+    _release(str(tmp_path / "a"))
+    _release(str(tmp_path / "b"))
+    assert _wait_for(lambda: _status(manager, first) == "done")
+    time.sleep(0.2)
+    assert _status(manager, queued) == "cancelled"
+    assert manager.status(queued)["started_at"] is None
+    assert not os.path.exists(tmp_path / "outputs" / "jobs" / queued / "result.json")
+
+
+def test_cancel_running_job_holds_its_slot(manager, tmp_path):
+    ids = [manager.submit({"path": str(tmp_path / f"j{i}")})[0]["id"] for i in range(3)]
+    assert _wait_for(lambda: _status(manager, ids[0]) == "running")
+    assert manager.cancel(ids[0])["status"] == "cancel_requested"
+    # still occupying the worker, so admission stays closed
+    assert manager.submit({"path": str(tmp_path / "j3")})[1] == "queue_full"
+    _release(str(tmp_path / "j0"))
+    assert _wait_for(lambda: _status(manager, ids[0]) == "cancelled")
+    assert manager.result(ids[0])["result"] is None
+    assert manager.submit({"path": str(tmp_path / "j3")})[1] is None
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"path": ""},
+    {"path": ["a"]},
+    {"path": "a", "baseline_path": 1},
+    {"path": "a", "target_column": ["label"]},
+    {"path": "a", "problem_type": {}},
+    {"path": "a", "evaluate_imputations": "false"},
+    {"path": "a", "evaluate_imputations": 1},
+])
+def test_invalid_params_rejected_before_job_exists(manager, params):
+    job, err = manager.submit(params)
+    assert job is None and err
+    assert manager.stats()["jobs"] == {}
+
+
+def test_valid_optional_params_accepted(manager, tmp_path):
+    job, err = manager.submit({"path": str(tmp_path / "v"), "evaluate_imputations": False,
+                               "target_column": "label", "baseline_path": None})
+    assert err is None
+    assert job["params"] == {"path": str(tmp_path / "v"), "evaluate_imputations": False, "target_column": "label"}
+
+
+def test_failed_job_reports_error(manager, tmp_path):
+    job_id = manager.submit({"path": str(tmp_path / "fail")})[0]["id"]
+    _release(str(tmp_path / "fail"))
+    assert _wait_for(lambda: _status(manager, job_id) == "failed")
+    assert "ValueError: boom" in manager.status(job_id)["error"]
+
+
+def test_dead_worker_restarts_pool(manager, tmp_path):
+    crashed = manager.submit({"path": str(tmp_path / "crash")})[0]["id"]
+    assert _wait_for(lambda: _status(manager, crashed) == "failed")
+    assert "BrokenProcessPool" in manager.status(crashed)["error"]
+    assert manager.stats()["active"] == 0
+    job_id = manager.submit({"path": str(tmp_path / "after")})[0]["id"]
+    _release(str(tmp_path / "after"))
+    assert _wait_for(lambda: _status(manager, job_id) == "done")
+    assert manager.stats()["pool_restarts"] >= 1
+
+
+def test_failing_initializer_makes_pool_unavailable(tmp_path):
+    mgr = JobManager(workers=2, max_pending=3, outputs_dir=str(tmp_path / "outputs"),
+                     runner=_stub_run, initializer=_broken_init, retry_interval=60)
+    try:
+        assert mgr.submit({"path": str(tmp_path / "a")}) == (None, "unavailable")
+        time.sleep(0.3)
+        stats = mgr.stats()
+        assert stats["pool_available"] is False
+        assert stats["pool_restarts"] == 0
+        assert stats["jobs"] == {}
+    finally:
+        mgr.shutdown()
+
+
+def test_finished_jobs_are_evicted(tmp_path):
+    mgr = JobManager(workers=1, max_pending=4, max_finished=2, outputs_dir=str(tmp_path / "outputs"),
+                     runner=_stub_run, initializer=_noop)
+    try:
+        ids = []
+        for i in range(3):
+            _release(str(tmp_path / f"j{i}"))
+            ids.append(mgr.submit({"path": str(tmp_path / f"j{i}")})[0]["id"])
+        assert _wait_for(lambda: mgr.status(ids[2]) is not None and _status(mgr, ids[2]) == "done")
+        assert mgr.status(ids[0]) is None
+        with open(mgr.status(ids[2])["result_path"], encoding="utf-8") as f:
+            assert json.load(f)["path"] == str(tmp_path / "j2")
+    finally:
+        mgr.shutdown()
+
+
+def test_http_result_transitions_202_to_200(manager, tmp_path):
+    handler = type("H", (JobRequestHandler,), {"manager": manager})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def call(method, url, body=None):
+        req = urllib.request.Request(base + url, method=method,
+                                     data=json.dumps(body).encode() if body is not None else None)
+        try:
+            with urllib.request.urlopen(req) as resp:
+                return resp.status, json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    try:
+        code, job = call("POST", "/jobs", {"path": str(tmp_path / "h")})
+        assert code == 202
+        code, res = call("GET", f"/jobs/{job['id']}/result")
+        assert code == 202 and res["result"] is None
+        _release(str(tmp_path / "h"))
+        assert _wait_for(lambda: call("GET", f"/jobs/{job['id']}/result")[0] == 200)
+        code, res = call("GET", f"/jobs/{job['id']}/result")
+        assert res["status"] == "done" and res["result"]["path"] == str(tmp_path / "h")
+        assert call("GET", "/jobs/nope")[0] == 404
+        assert call("POST", "/jobs", {})[0] == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("length", ["-1", "abc", str(10 ** 9)])
+def test_http_rejects_bad_content_length(manager, length):
+    handler = type("H", (JobRequestHandler,), {"manager": manager})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        conn.putrequest("POST", "/jobs")
+        conn.putheader("Content-Length", length)
+        conn.endheaders()
+        resp = conn.getresponse()
+        assert resp.status == 400
+        assert manager.stats()["jobs"] == {}
+    finally:
+        conn.close()
+        server.shutdown()
+        server.server_close()